@@ -13,45 +13,58 @@ At this time, we are not using such things as `pyrsmi` (that is the AMD equivale
 We thought the initial implementation of WheelNext variant provider should be lightweight, dependency-free, and non-intrusive.
 Based on the "Right Tool for the Job" principle, using `pyrsmi` for now for this task is like using a sledgehammer to hang a picture frame.
 
-The current method relies on the `rocminfo` command which is standard in any ROCm install.
+The GFX architectures are primarily read from the KFD topology that the kernel exposes in sysfs, with no subprocess at all.
+Only when it isn't available (e.g., containers without it) do we fall back on the `rocminfo` command, which is standard in any ROCm install.
+
+Detection can be short-circuited (no filesystem or subprocess I/O at all) with these environment variables,
+e.g., in CI or containers where the ROCm tools or sysfs nodes aren't available:
+- `AMD_ROCM_VERSION`: ROCm version, e.g., "6.2" or "6.4.3".
+- `AMD_GFX_ARCHS`: GFX architectures separated by commas, spaces or semicolons, e.g., "gfx942,gfx1100".
+- `AMD_KMD_VERSION`: AMDGPU KMD version, e.g., "6.7.0".
 """
 
 from __future__ import annotations
 import logging
 import os
-import platform
 import re
 import sys
-import shutil
-import subprocess
-from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional, Tuple, List, Dict, Any
 from dataclasses import dataclass
 from functools import lru_cache
 #from enum import StrEnum
 
+# The provider is loaded by `pip` on every platform, but all the probes below are Linux-only.
+# Skip importing `subprocess`/`shutil` elsewhere to keep the import cheap there.
+# Evaluated once: a process cannot change OS mid-run.
+# Likewise, `pathlib` and `json` are only imported by the (cold) functions that need them.
+_IS_LINUX = sys.platform.startswith("linux")
+if _IS_LINUX:
+    import shutil
+    import subprocess
+if TYPE_CHECKING:
+    from pathlib import Path
+
 logger = logging.getLogger(__name__)
 
 # Currently only have major/minor/patch versions, but might want to add more version identifiers in the future
-@dataclass(frozen=True)
-class ROCmVersion:
+# `NamedTuple` (rather than a frozen `dataclass`) for C-level tuple storage, hashing and comparison;
+# these are the values returned (and cached) by the hot detection path.
+class ROCmVersion(NamedTuple):
     major: int = 0
     minor: int = 0
     patch: int = 0
 
-#    def __init__(self, ver_list: List[str]):
-#        print("Calling __init__")
-#        [self.major, self.minor, self.patch] = ver_list
+    def __str__(self) -> str:
+        return f"{self.major}.{self.minor}.{self.patch}"
 
-#    def __str__(self):
-#      return f"{self.major}.{self.minor}.{self.patch}"
-
-@dataclass(frozen=True)
-class KMDVersion:
+class KMDVersion(NamedTuple):
     major: int = 0
     minor: int = 0
     patch: int = 0
 
+    def __str__(self) -> str:
+        return f"{self.major}.{self.minor}.{self.patch}"
+
 # StrEnum not supported for py<=3.10
 #class AMDVariantFeatureKey(StrEnum):
 class AMDVariantFeatureKey():
@@ -63,10 +76,100 @@ class AMDVariantFeatureKey():
 # Unused yet.
 @dataclass(frozen=True)
 class ROCmEnvironment:
-    kernel_module_version: Optional[str]  # `modinfo amdgpu | grep -Ei '^version:'
+    kernel_module_version: Optional[KMDVersion]  # `modinfo amdgpu | grep -Ei '^version:'
     rocm_version: Optional[ROCmVersion]  # `rocminfo`
     gfx_archs: List[str]  # `rocminfo` or `rocm_agent_enumerator -name`
 
+# Regexes are compiled once at import time rather than on every probe.
+# All the tokens of interest (versions, gfx names) are ASCII-only, so `re.ASCII` is used.
+# Regex for ROCm version (like "5.7" or "6.4.3", only major/minor)
+# Case-sensitive and matched at the start of the line, like the `startswith(b"ROCm")` prefilter that gates it.
+_ROCM_VERSION_REGEX = re.compile(rb"ROCm(?:\s+Version)?[:\s]*(\d+)\.(\d+)(?:\.\d+)?", re.ASCII)
+_KMD_VERSION_REGEX_IN_ROCMINFO = re.compile(rb"ROCk module version (\d+)\.(\d+)\.(\d+)", re.ASCII)
+# The tool outputs are scanned as raw bytes; only the few kept GFX names get decoded.
+# No word boundaries nor capture group: `.group(0)` is the GFX name.
+_GFX_REGEX = re.compile(rb"gfx[0-9a-f]+", re.ASCII)
+# Anchored at both ends of an (already left-stripped) `rocminfo` agent "Name:" line, so it can't backtrack
+# over the rest of the line.
+_ROCMINFO_GFX_NAME_REGEX = re.compile(rb"Name:\s+(gfx[0-9a-f]+)\s*$", re.ASCII)
+# RegEx for GFX inspired by https://github.com/ROCm/rocminfo/blob/c34ac33d661bd2c87d9c3b956eb8b15ac8f7092c/rocm_agent_enumerator#L95
+#_GFX_REGEX = re.compile(r"(gfx[0-9a-fA-F]+(?:-[0-9a-fA-F]+)?(?:-generic)?(?:[:][-+:\w]+)?)")
+# Separators of the list env vars (e.g., "gfx942,gfx1100" or "gfx942 gfx1100").
+_LIST_SPLIT_REGEX = re.compile(r"[,\s;]+")
+# Separators of the version strings (e.g., "6.4.3" or "6.4.3-120" in the ROCm version file).
+_VERSION_SPLIT_REGEX = re.compile(r"[.-]")
+
+# The two parsers below are shared with "plugin.py", so that the detection overrides and the plugin's
+# `AMD_VARIANT_PROVIDER_FORCE_*` overrides accept exactly the same syntax.
+
+def parse_list_env(env_val: Optional[str]) -> List[str]:
+    """
+    Splits a list env var value on commas, whitespace or semicolons, dropping empty items.
+    """
+    if not env_val:
+        return []
+    env_val = env_val.strip()
+    # Fast path for the common single value (e.g., "gfx1100"): no separator can be in an alphanumeric string.
+    if env_val.isalnum():
+        return [env_val]
+    return [p for p in _LIST_SPLIT_REGEX.split(env_val) if p]
+
+def parse_version(text: str, version_cls: type = ROCmVersion) -> Optional[Any]:
+    """
+    Parses a version string (e.g., "6.2", "6.4.3" or "6.4.3-rc1") into `version_cls`.
+    At least major.minor is required; anything after major.minor.patch (e.g., a build number or "-rc1") is ignored.
+
+    Returns:
+        The version (e.g. ROCmVersion(6, 4, 3)) or None if `text` isn't a valid version.
+    """
+    parts = _VERSION_SPLIT_REGEX.split(text.strip(), 3)
+    if len(parts) < 2 or not parts[0].isdigit() or not parts[1].isdigit():
+        return None
+    patch = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+    return version_cls(int(parts[0]), int(parts[1]), patch)
+
+# FIXME:
+# Brittle and NOT future-proof.
+# MI and Navi
+# https://github.com/pytorch/pytorch/blob/4d5f92aa39d294a833038299aa3f38f99ebc31b6/.ci/docker/manywheel/build.sh#L86
+# Also refer to https://d2awnip2yjpvqn.cloudfront.net/v2 (internal only?)
+_DEFAULT_GFX_ALLOWLIST = frozenset({"gfx900", "gfx906", "gfx908", "gfx90a", "gfx942", "gfx1030", "gfx1100", "gfx1101", "gfx1102", "gfx1200", "gfx1201"})
+
+@lru_cache(maxsize=8)
+def _parse_gfx_allowlist(env_val: Optional[str]) -> frozenset[str]:
+    """
+    GFX architectures accepted from the detection: the value of `AMD_PREFERRED_GFX_ARCHS` (see `parse_list_env()`) if set, else the defaults.
+    """
+    from_env = frozenset(parse_list_env(env_val))
+    return from_env or _DEFAULT_GFX_ALLOWLIST
+
+def _which(name: str) -> Optional[str]:
+    """
+    `shutil.which` walks (and stats) every `PATH` entry, so the lookups are cached per `PATH` value.
+    """
+    if not _IS_LINUX:
+        # The ROCm tools probed here only exist on Linux (and `shutil` isn't imported elsewhere).
+        return None
+    return _which_in_path(name, os.environ.get("PATH"))
+
+@lru_cache(maxsize=32)
+def _which_in_path(name: str, path: Optional[str]) -> Optional[str]:
+    return shutil.which(name, path=path)
+
+def _read_small_file(path: str, max_size: int = 64) -> bytes:
+    """
+    Reads (up to `max_size` bytes of) a tiny file such as a version file with raw `os.open`/`os.read`,
+    skipping the buffered IO objects that `open()` builds. Raises `OSError` if it can't be read.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, max_size)
+    finally:
+        os.close(fd)
+
+_KMD_VERSION_FILE = "/sys/module/amdgpu/version"
+_ROCM_PATH_DEFAULT = "/opt/rocm"
+
 def _get_amdgpu_kmd_version() -> Optional[KMDVersion]:
     """
     Detects the version of the installed AMDGPU KMD.
@@ -79,67 +182,124 @@ def _get_amdgpu_kmd_version() -> Optional[KMDVersion]:
         The version string of the KMD (e.g., "6.7.99") or None if not found.
     """
     # Strategy 1: Read directly from the `/sys/` (most efficient w/o launching a subprocess)
+    # A single open+read; a missing file just raises, so no separate existence check (stat) is needed.
     try:
-        version_path = Path("/sys/module/amdgpu/version")
-        if version_path.is_file():
-            kmd_version = version_path.read_text(encoding="utf-8").strip()
-            # Basic validation to ensure the file isn't empty
-            if kmd_version:
-                return KMDVersion(*map(int, kmd_version.split(".")))
-    except (IOError, OSError):
+        kmd_version = parse_version(_read_small_file(_KMD_VERSION_FILE).decode("ascii", errors="replace"), KMDVersion)
+        # `None` if the file is empty or holds an unexpected format.
+        if kmd_version:
+            return kmd_version
+    except OSError:
         # This can happen if there are permission issues or the file doesn't exist.
         pass  # Silently fall through to the next strategy.
 
     # Strategy 2: Fallback to parsing `modinfo` (more robust)
+    exec_path = _which("modinfo")
+    if not exec_path:
+        return None
     try:
         result = subprocess.run(
-            ["modinfo", "amdgpu"],
+            [exec_path, "amdgpu"],
             capture_output=True,
             text=True,
             check=True,
             timeout=10,
         )
-        match = re.search(r"^version:\s*(\d+)\.(\d+).(\d+)", result.stdout, re.MULTILINE)
-        if match:
-            return KMDVersion(*map(int, match.groups()))
-    except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
-        # This can happen if `modinfo` isn't in the PATH or the module doesn't exist.
+        # The "version:" line is trivially parsable w/o a regex, e.g., "version:        6.7.99-2003423.22.04"
+        for line in result.stdout.splitlines():
+            if line.startswith("version:"):
+                # Same parser as the sysfs file; the "-<build>" suffix is ignored.
+                return parse_version(line[len("version:"):], KMDVersion)
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        # This can happen if `modinfo` vanished or isn't runnable after the `PATH` lookup, or the module doesn't exist.
         return None
 
     return None
 
-# Regex for ROCm version (like "5.7" or "6.4.3", only major/minor)
-_ROCM_VERSION_REGEX = re.compile(r"ROCm(?:\s+Version)?[:\s]*(\d+)\.(\d+)(?:\.\d+)?", re.IGNORECASE)
-_KMD_VERSION_REGEX_IN_ROCMINFO = re.compile(r"ROCk module version (\d+)\.(\d+)\.(\d+)")
-_GFX_REGEX = re.compile(r"\b(gfx\d+[0-9a-f]*)\b")
-# RegEx for GFX inspired by https://github.com/ROCm/rocminfo/blob/c34ac33d661bd2c87d9c3b956eb8b15ac8f7092c/rocm_agent_enumerator#L95
-#_GFX_REGEX = re.compile(r"(gfx[0-9a-fA-F]+(?:-[0-9a-fA-F]+)?(?:-generic)?(?:[:][-+:\w]+)?)")
+_KFD_TOPOLOGY_NODES = "/sys/class/kfd/kfd/topology/nodes"
+
+def _get_gfx_from_kfd_topology() -> List[str]:
+    """
+    Detects the GFX architectures by reading the KFD topology exposed by the kernel in sysfs.
+
+    Each node directory (`/sys/class/kfd/kfd/topology/nodes/<N>/`) has a `properties` file of
+    "key value" lines. CPU nodes report `simd_count 0` and are skipped (the textual equivalent of
+    `Device Type: GPU` in `rocminfo`). `gfx_target_version` is a decimal encoding of the GFX IP,
+    i.e., major * 10000 + minor * 100 + stepping, where minor/stepping are printed in hex
+    (e.g., 90402 -> "gfx942", 90010 -> "gfx90a", 110000 -> "gfx1100").
+
+    This avoids spawning `rocminfo` (and initializing the HSA runtime) altogether.
+
+    Returns:
+        A sorted list of unique GFX names (e.g., ["gfx90a", "gfx1030"]), or [] if not available
+        (e.g., containers without the sysfs KFD topology).
+    """
+    from pathlib import Path
+
+    vals = set()
+    try:
+        nodes = list(Path(_KFD_TOPOLOGY_NODES).iterdir())
+    except OSError:
+        return []
+
+    for node in nodes:
+        try:
+            props = node.joinpath("properties").read_text(encoding="ascii", errors="replace")
+        except OSError:
+            continue
+        # `partition` always yields a (key, value) pair, even for a malformed line such as "key ".
+        fields = dict(line.partition(" ")[::2] for line in props.splitlines())
+        try:
+            if int(fields.get("simd_count", "0")) <= 0:
+                continue
+            target = int(fields.get("gfx_target_version", "0"))
+        except ValueError:
+            continue
+        if target:
+            major, minor, stepping = target // 10000, (target // 100) % 100, target % 100
+            vals.add(f"gfx{major}{minor:x}{stepping:x}")
+            continue
+        # Older kernels lack `gfx_target_version`; the node `name` may carry the GFX name instead.
+        try:
+            m = _GFX_REGEX.search(node.joinpath("name").read_bytes())
+        except OSError:
+            continue
+        if m:
+            vals.add(m.group(0).decode("ascii"))
+    return sorted(vals)
 
 def _get_gfx_from_agent_enumerator() -> list[str]:
-    exec_path = shutil.which("rocm_agent_enumerator")
+    exec_path = _which("rocm_agent_enumerator")
     if not exec_path:
         return []
     try:
         # The `-name` option prints just the architecture names; it's designed for scripts.
         # Debian manpage: rocm_agent_enumerator(1)
         # ROCm docs: "prints list of available architecture names".
-        proc = subprocess.run(
+        # Only stdout is needed: stderr is discarded, and the (pure ASCII) output is kept as bytes
+        # rather than going through a text-mode wrapper.
+        output = subprocess.run(
             [exec_path, "-name"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             check=True,
             timeout=5,
-        )
-        vals = []
-        for line in proc.stdout.splitlines():
+        ).stdout
+        vals = set()
+        for line in output.splitlines():
+            # Cheap substring check first; the regex only runs on lines that can match.
+            if b"gfx" not in line:
+                continue
             m = _GFX_REGEX.search(line)
-            #print(m)
-            tok = None if not m else m.group(1).lower()
+            tok = None if not m else m.group(0).decode("ascii")
             # "gfx000" represents CPU. Keep GPUs only.
             if tok and tok != "gfx000":
-                vals.append(tok)
-        return sorted(set(vals))
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                vals.add(tok)
+        # Deduplicated while scanning; sorted for deterministic output.
+        return sorted(vals)
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        # `OSError` covers an executable that vanished or isn't runnable after the `PATH` lookup;
+        # the caller's fallback chain must never be aborted by this probe.
+        logger.debug("Could not run `rocm_agent_enumerator`: %s", e)
         return []
 
 def _get_info_from_rocminfo() -> Dict[str, Any]:
@@ -159,52 +319,65 @@ def _get_info_from_rocminfo() -> Dict[str, Any]:
         * AMDVariantFeatureKey.KMD_VERSION (e.g. KMDVersion(6, 10, 5))
         * AMDVariantFeatureKey.GFX_ARCH (e.g., ["gfx90a", "gfx1030"]).
     """
-    if platform.system() != "Linux":
+    if not _IS_LINUX:
         logger.info("ROCm detection skipped: not running on Linux")
         return {}
 
     info = {}
 
-    exec_path = shutil.which("rocminfo")
+    exec_path = _which("rocminfo")
     if not exec_path:
         return info
 
     try:
         # The `rocminfo` tool is one of the standard ways to get system-level ROCm details.
-        output = subprocess.check_output(
+        output = subprocess.run(
             [exec_path],
-            text=True,
+            stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
+            check=True,
             timeout=7,  # No need for large timeouts because of confirmed existence
-        )
-
-        # Find KMD version
-        kmd_version_match = _KMD_VERSION_REGEX_IN_ROCMINFO.search(output)
-        if kmd_version_match:
-            major, minor, patch = map(int, kmd_version_match.groups())
-            info[AMDVariantFeatureKey.KMD_VERSION] = KMDVersion(major, minor, patch)
+        ).stdout
+
+        # Single pass over the (bytes) output: cheap prefilters pick the few interesting lines,
+        # and a regex is only run on those.
+        # GFX names are deduplicated as they are found (`rocminfo` prints each of them several times).
+        gfx_matches = set()
+        for line in output.splitlines():
+            s = line.lstrip()
+            if s.startswith(b"ROCk module version"):
+                if AMDVariantFeatureKey.KMD_VERSION not in info:
+                    kmd_version_match = _KMD_VERSION_REGEX_IN_ROCMINFO.match(s)
+                    if kmd_version_match:
+                        info[AMDVariantFeatureKey.KMD_VERSION] = KMDVersion(*map(int, kmd_version_match.groups()))
+            elif s.startswith(b"ROCm"):
+                if AMDVariantFeatureKey.ROCM_VERSION not in info:
+                    rocm_version_match = _ROCM_VERSION_REGEX.match(s)
+                    if rocm_version_match:
+                        info[AMDVariantFeatureKey.ROCM_VERSION] = ROCmVersion(*map(int, rocm_version_match.groups()))
+            elif s.startswith(b"Name:") and b"gfx" in s:
+                # Only the agent names (e.g., "Name: gfx90a") are taken. The ISA names
+                # (e.g., "Name: amdgcn-amd-amdhsa--gfx90a:sramecc+:xnack-") just repeat them,
+                # or are generic targets (e.g., "amdgcn-amd-amdhsa--gfx9-4-generic") that aren't GFX archs.
+                # No early exit here: the agents of a multi-GPU node are listed one after another.
+                gfx_match = _ROCMINFO_GFX_NAME_REGEX.match(s)
+                if gfx_match:
+                    gfx_matches.add(gfx_match.group(1))
 
         # Find all unique GFX versions.
         # FIXME:
         # `rocm_agent_enumerator -name` may be better than `rocminfo` because it prints clear `gfx*` names.
-        gfx_matches = _GFX_REGEX.findall(output)
         if gfx_matches:
-            # FIXME:
-            # Brittle and NOT future-proof.
-            # MI and Navi
-            # https://github.com/pytorch/pytorch/blob/4d5f92aa39d294a833038299aa3f38f99ebc31b6/.ci/docker/manywheel/build.sh#L86
-            # Also refer to https://d2awnip2yjpvqn.cloudfront.net/v2 (internal only?)
-            GFX_CODE = [g.strip() for g in os.environ.get("AMD_PREFERRED_GFX_ARCHS", "").split(',') if g.strip()] or ["gfx900", "gfx906", "gfx908", "gfx90a", "gfx942", "gfx1030", "gfx1100", "gfx1101", "gfx1102", "gfx1200", "gfx1201"]
-            # Use a set to store unique GFX versions, then sort for deterministic output.
+            # Sort the unique GFX versions for deterministic output.
             # TODO: prioritized list may be needed.
             # TODO: Does this need to be of a specific type
-            unique_gfx = sorted(set(gfx_matches))
-            if all(x in GFX_CODE for x in unique_gfx):
-                info[AMDVariantFeatureKey.GFX_ARCH] = unique_gfx
-                logging.info(f"Found GFX architectures: {unique_gfx} via `rocminfo`.")
+            unique_gfx = sorted(m.decode("ascii") for m in gfx_matches)
+            info[AMDVariantFeatureKey.GFX_ARCH] = unique_gfx
+            logger.info("Found GFX architectures: %s via `rocminfo`.", unique_gfx)
 
-    except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired, Exception) as e:
-        logging.error(f"Could not run or parse `rocminfo`: {e}")
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        # Only the expected run failures; anything else is a bug and must surface.
+        logger.error("Could not run `rocminfo`: %s", e)
 
     return info
 
@@ -212,81 +385,274 @@ def _get_rocm_version_from_dir(rocm_path_str: Optional[str] = None) -> Optional[
     """
     (Fallback) Attempts to infer the ROCm version from the version file in a given directory.
     """
-    rocm_path: Optional[Path] = None
-    if rocm_path_str:
-        rocm_path = Path(rocm_path_str)
-    else:
-        path_str_from_env = os.environ.get("ROCM_PATH")
-        if path_str_from_env:
-            rocm_path = Path(path_str_from_env)
-    if not rocm_path:
-        rocm_path = Path("/opt/rocm")
+    rocm_path = rocm_path_str or os.environ.get("ROCM_PATH") or _ROCM_PATH_DEFAULT
 
     # TODO: Remove since hip/rocm_version.h is more robust for both Linux/Windows
     # A happy path for checking ROCm version on Linux
     # Refs.: https://rocmdocs.amd.com/projects/rccl/en/latest/how-to/troubleshooting-rccl.html
-    version_file = rocm_path / ".info" / "version"
-    if version_file.is_file():
-        try:
-            content = version_file.read_text(encoding="utf-8").strip()
-            # The version file typically just contains "x.y.z"
-            parts = re.split(r"[.-]", content)
-            if len(parts) >= 3:
-                major, minor, patch = int(parts[0]), int(parts[1]), int(parts[2]) 
-                logging.info(f"Found rocm{major}.{minor}.{patch} via version file: {version_file}")
-                return ROCmVersion(major, minor, patch)
-            elif len(parts) >= 2:
-                major, minor = int(parts[0]), int(parts[1])
-                logging.info(f"Found rocm{major}.{minor} via version file: {version_file}")
-                return ROCmVersion(major, minor)
-        except (ValueError, IOError) as e:
-            logging.error(f"Error reading ROCm version file: {e}")
-    return None
+    # Plain `str` path (no `Path` objects), and no separate existence check: a missing file just fails the `open`.
+    version_file = os.path.join(rocm_path, ".info", "version")
+    try:
+        content = _read_small_file(version_file).decode("ascii", errors="replace").strip()
+    except OSError:
+        return None
+    # The version file typically just contains "x.y.z" (or "x.y.z-<build>")
+    version = parse_version(content)
+    if version:
+        logger.info("Found rocm%s via version file: %s", version, version_file)
+    elif content:
+        logger.error("Error parsing ROCm version file %s: %r", version_file, content)
+    return version
 
     # TODO (REQUIRED FOR WINDOWS): use `rocm_version.h` and then `hip_version.h`
     # TODO (optional): `apt show rocm-libs -a` as a distro-specific fallback.
 
+def _version_from_env(env_name: str, env_val: Optional[str], version_cls: type) -> Optional[Any]:
+    """
+    Parses a version override (e.g., "6.2" or "6.4.3") given as the value `env_val` of the environment variable `env_name`.
+    """
+    if not env_val:
+        return None
+    version = parse_version(env_val, version_cls)
+    if not version:
+        logger.warning("Ignoring invalid %s=%r", env_name, env_val)
+    return version
+
+# The GFX architectures reported by `rocminfo`/`rocm_agent_enumerator` are also persisted on disk, since `pip` runs
+# the provider in a fresh interpreter each time and spawning the tools is by far the most expensive probe.
+# Each entry is keyed by:
+# - the tool's path and mtime, which change when ROCm is upgraded;
+# - the boot ID and host name, so that hosts or containers sharing $HOME (e.g., over NFS) don't share results,
+#   and a GPU swap (which needs a reboot) is picked up;
+# - the mtime of the AMDGPU KMD version file in sysfs, which changes whenever the driver is (re)loaded;
+# - the env vars that restrict the GPUs visible to the tools.
+# Nothing is persisted if any of them can't be read (e.g., the AMDGPU KMD isn't loaded).
+# Only those results are persisted: the ROCm/KMD versions and the KFD topology are single tiny file reads,
+# no more expensive than reading the cache itself.
+
+def _disk_cache_path() -> Path:
+    from pathlib import Path
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "amd_variant_provider" / "gfx_archs.json"
+
+_BOOT_ID_FILE = "/proc/sys/kernel/random/boot_id"
+
+def _tool_fingerprint(exec_path: str) -> Optional[List[Any]]:
+    try:
+        tool_mtime = os.stat(exec_path).st_mtime_ns
+        kmd_mtime = os.stat(_KMD_VERSION_FILE).st_mtime_ns
+        boot_id = _read_small_file(_BOOT_ID_FILE).decode("ascii", errors="replace").strip()
+    except OSError:
+        return None
+    if not boot_id:
+        return None
+    return [
+        exec_path,
+        tool_mtime,
+        boot_id,
+        os.uname().nodename,
+        kmd_mtime,
+        os.environ.get("ROCR_VISIBLE_DEVICES"),
+        os.environ.get("HIP_VISIBLE_DEVICES"),
+    ]
+
 @lru_cache(maxsize=1)
-def get_system_info() -> Dict[str, Any]:
+def _load_disk_cache() -> Dict[str, Any]:
+    """
+    Loads the detection results persisted by a previous process, or {} if missing or unreadable.
+    The returned dict is updated in place by `_load_cached_or_compute()`.
+    """
+    import json
+
+    try:
+        data = json.loads(_disk_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _store_disk_cache(data: Dict[str, Any]) -> None:
+    import json
+
+    path = _disk_cache_path()
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        # Atomic, so that concurrent `pip` processes never see a partially written file.
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("Could not write the detection cache %s: %s", path, e)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+def _load_cached_or_compute(tool: str, compute: Callable[[], List[str]]) -> List[str]:
+    """
+    Returns the GFX architectures reported by the command `tool` from the on-disk cache if its fingerprint still matches,
+    or runs `compute()` and persists its (non-empty) result.
     """
-    Detects installed ROCm version and GFX architectures using multiple strategies.
+    exec_path = _which(tool)
+    fingerprint = _tool_fingerprint(exec_path) if exec_path else None
+    if fingerprint is None:
+        return compute()
+    cache = _load_disk_cache()
+    entry = cache.get(tool)
+    if isinstance(entry, dict) and entry.get("fingerprint") == fingerprint and isinstance(entry.get("gfx_archs"), list):
+        return list(entry["gfx_archs"])
+    value = compute()
+    if value:
+        cache[tool] = {"fingerprint": fingerprint, "gfx_archs": value}
+        _store_disk_cache(cache)
+    return value
+
+# Each feature has its own cached getter so that callers only pay for the probes they actually consult
+# (e.g., the plugin never needs the KMD version, so `modinfo amdgpu` is never spawned on its behalf).
+# The caches are keyed by the values of the environment variables each detection depends on, which are passed in
+# explicitly, so that changing them (e.g., in tests or CI) is honored instead of returning stale results.
+
+@lru_cache(maxsize=1)
+def _get_cached_info_from_rocminfo() -> Dict[str, Any]:
+    """
+    Runs `rocminfo` at most once per process, shared by the getters below.
+    Its raw output doesn't depend on any of the env vars; e.g., the GFX allow-list is applied by the caller.
+    """
+    return _get_info_from_rocminfo()
+
+def _detect_gfx_archs(preferred_env: Optional[str]) -> List[str]:
+    # The first strategy that finds anything answers; the allow-list is then applied to its result, whichever it is.
+    # Unknown GFX names are dropped individually rather than discarding the whole result.
+    gfx_archs = _detect_gfx_archs_unfiltered()
+    allowlist = _parse_gfx_allowlist(preferred_env)
+    return [g for g in gfx_archs if g in allowlist]
+
+def _detect_gfx_archs_unfiltered() -> List[str]:
+    # Strategy 1: Read the KFD topology directly from sysfs (cheapest)
+    from_kfd = _get_gfx_from_kfd_topology()
+    if from_kfd:
+        logger.info("Found GFX architectures: %s via KFD topology.", from_kfd)
+        return from_kfd
+
+    # Strategy 2: Use `rocminfo`
+    from_rocminfo = _load_cached_or_compute(
+        "rocminfo", lambda: list(_get_cached_info_from_rocminfo().get(AMDVariantFeatureKey.GFX_ARCH, []))
+    )
+    if from_rocminfo:
+        return from_rocminfo
+
+    # Strategy 3: Use `rocm_agent_enumerator`
+    # FIXME: This approach to querying GFX is technically more preferred.
+    return _load_cached_or_compute("rocm_agent_enumerator", _get_gfx_from_agent_enumerator)
+
+def get_gfx_archs() -> Tuple[str, ...]:
+    """
+    Detects the GFX architectures.
 
     Strategies, in order of preference:
-    1. Run the `rocminfo` command (Linux only).
-    2. Check the `ROCM_PATH` environment variable for a version file.
-    3. Check the default installation path "/opt/rocm" for a version file.
+    1. Read the KFD topology in sysfs (no subprocess).
+    2. Run the `rocminfo` command (Linux only) if sysfs has nothing to offer (e.g., containers w/o the KFD bind-mount).
+    3. Run the `rocm_agent_enumerator -name` command.
+
+    `AMD_GFX_ARCHS` takes precedence over all of them. The results of the two commands are also cached on disk.
 
     Returns:
-        A dictionary with AMDVariantFeatureKey.ROCM_VERSION and AMDVariantFeatureKey.GFX_ARCH.
-    """
-    # Strategy 1: Use `rocminfo` to get everything at once
-    info = _get_info_from_rocminfo()
-
-    # Fallback for ROCm version if `rocminfo` failed or didn't find it
-    if AMDVariantFeatureKey.ROCM_VERSION not in info:
-        # Strategy 2: Check `ROCM_PATH` environment variable
-        rocm_path_env = os.environ.get("ROCM_PATH")
-        version = _get_rocm_version_from_dir(rocm_path_env)
-        if version:
-            info[AMDVariantFeatureKey.ROCM_VERSION] = version
-    if AMDVariantFeatureKey.GFX_ARCH not in info:
-        # FIXME: This approach to querying GFX is technically more preferred.
-        from_agent = _get_gfx_from_agent_enumerator()
-        if from_agent:
-            info[AMDVariantFeatureKey.GFX_ARCH] = from_agent
-
-    if AMDVariantFeatureKey.KMD_VERSION not in info:
-        # This "kmd_version" may be not needed for the current simple, straightforward AMD WheelNext variant provider.
-        info[AMDVariantFeatureKey.KMD_VERSION] = _get_amdgpu_kmd_version()
+        A sorted tuple of GFX names (e.g., ("gfx1030", "gfx90a")), empty if none could be detected.
+    """
+    return _get_gfx_archs(os.environ.get("AMD_GFX_ARCHS"), os.environ.get("AMD_PREFERRED_GFX_ARCHS"))
+
+@lru_cache(maxsize=8)
+def _get_gfx_archs(gfx_archs_env: Optional[str], preferred_env: Optional[str]) -> Tuple[str, ...]:
+    from_env = set(parse_list_env(gfx_archs_env))
+    if from_env:
+        return tuple(sorted(from_env))
+
+    return tuple(_detect_gfx_archs(preferred_env))
+
+def _detect_rocm_version(rocm_path: Optional[str]) -> Optional[ROCmVersion]:
+    version = _get_rocm_version_from_dir(rocm_path or _ROCM_PATH_DEFAULT)
+    if version:
+        return version
+    return _get_cached_info_from_rocminfo().get(AMDVariantFeatureKey.ROCM_VERSION)
+
+def get_rocm_version() -> Optional[ROCmVersion]:
+    """
+    Detects the installed ROCm version.
+
+    Strategies, in order of preference:
+    1. Check the `ROCM_PATH` environment variable, or the default installation path "/opt/rocm", for a version file.
+    2. Run the `rocminfo` command (Linux only).
+
+    The version file is tried first since it is a single tiny file read, whereas `rocminfo` rarely reports the version anyway.
+    `AMD_ROCM_VERSION` takes precedence over all of them.
+
+    Returns:
+        The ROCm version (e.g. ROCmVersion(6, 4, 3)) or None if not found.
+    """
+    return _get_rocm_version(os.environ.get("AMD_ROCM_VERSION"), os.environ.get("ROCM_PATH"))
+
+@lru_cache(maxsize=8)
+def _get_rocm_version(rocm_version_env: Optional[str], rocm_path: Optional[str]) -> Optional[ROCmVersion]:
+    version = _version_from_env("AMD_ROCM_VERSION", rocm_version_env, ROCmVersion)
+    if version:
+        return version
+    return _detect_rocm_version(rocm_path)
+
+def get_kmd_version() -> Optional[KMDVersion]:
+    """
+    Detects the version of the installed AMDGPU KMD.
+    This "kmd_version" may be not needed for the current simple, straightforward AMD WheelNext variant provider.
+    `AMD_KMD_VERSION` takes precedence over the detection.
+
+    Returns:
+        The KMD version (e.g. KMDVersion(6, 10, 5)) or None if not found.
+    """
+    return _get_kmd_version(os.environ.get("AMD_KMD_VERSION"))
+
+@lru_cache(maxsize=8)
+def _get_kmd_version(kmd_version_env: Optional[str]) -> Optional[KMDVersion]:
+    version = _version_from_env("AMD_KMD_VERSION", kmd_version_env, KMDVersion)
+    if version:
+        return version
+    return _get_amdgpu_kmd_version()
+
+def get_system_info() -> Dict[str, Any]:
+    """
+    Detects installed ROCm version, KMD version and GFX architectures.
+
+    Thin aggregator over `get_rocm_version()`, `get_gfx_archs()` and `get_kmd_version()`, kept for backward compatibility.
+    Prefer the individual getters to avoid probing for features that aren't needed.
+
+    Returns:
+        A dictionary with AMDVariantFeatureKey.ROCM_VERSION, AMDVariantFeatureKey.KMD_VERSION and AMDVariantFeatureKey.GFX_ARCH,
+        each only present if detected.
+    """
+    info: Dict[str, Any] = {}
+
+    gfx_archs = get_gfx_archs()
+    if gfx_archs:
+        info[AMDVariantFeatureKey.GFX_ARCH] = list(gfx_archs)
+
+    rocm_version = get_rocm_version()
+    if rocm_version:
+        info[AMDVariantFeatureKey.ROCM_VERSION] = rocm_version
+
+    kmd_version = get_kmd_version()
+    if kmd_version:
+        info[AMDVariantFeatureKey.KMD_VERSION] = kmd_version
 
     if not info:
-        logging.warning("None of ROCm version / KFD version / GFX architecture could be detected.")
+        logger.warning("None of ROCm version / KFD version / GFX architecture could be detected.")
 
     return info
 
 if __name__ == "__main__":
+    print(f"{_get_gfx_from_kfd_topology()=}")
     print(f"{_get_info_from_rocminfo()=}")
     print(f"{_get_rocm_version_from_dir()=}")
     print(f"{_get_gfx_from_agent_enumerator()=}")
     print(f"{_get_amdgpu_kmd_version()=}")
+    print(f"{get_gfx_archs()=}")
+    print(f"{get_rocm_version()=}")
+    print(f"{get_kmd_version()=}")
     print(f"{get_system_info()=}")
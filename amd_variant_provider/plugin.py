@@ -17,12 +17,11 @@ from __future__ import annotations
 import logging
 import os
 import sys
-import re
 from dataclasses import dataclass
 from functools import cache
 from typing import Any, List, Protocol, runtime_checkable
 
-from amd_variant_provider.detect_rocm import get_system_info, ROCmEnvironment, AMDVariantFeatureKey, ROCmVersion
+from amd_variant_provider.detect_rocm import get_gfx_archs, get_rocm_version, parse_list_env, parse_version, ROCmEnvironment, AMDVariantFeatureKey, ROCmVersion
 
 logging.basicConfig(level=os.environ.get("AMD_VARIANT_PROVIDER_LOGLEVEL", "INFO"))
 logger = logging.getLogger(__name__)
@@ -41,6 +40,12 @@ class VariantFeatureConfig:
     values: list[str]
     multi_value: bool = False
 
+# Nothing dynamic, so it's built once at import time (`VariantFeatureConfig` is frozen, so safe to share).
+_ALL_CONFIGS: list[VariantFeatureConfig] = [
+    VariantFeatureConfig(name=AMDVariantFeatureKey.ROCM_VERSION, values=[f"7.{i}" for i in range(10, -1, -1)] + ["6.4", "6.3"], multi_value=False),
+    VariantFeatureConfig(name=AMDVariantFeatureKey.GFX_ARCH, values=["gfx900", "gfx906", "gfx908", "gfx90a", "gfx942", "gfx1030", "gfx1100", "gfx1101", "gfx1102", "gfx1200", "gfx1201"], multi_value=True),
+]
+
 class AMDVariantPlugin:
     """
     The AMD ROCm Variant Provider Plugin.
@@ -48,44 +53,58 @@ class AMDVariantPlugin:
     """
     namespace = "amd"
     is_build_plugin = False
+    # Log message prefix, formatted once
+    _log_prefix = f"[{namespace}-variant-provider]"
 
     # WheelNext static plugin API
     dynamic = False
 
-    @staticmethod
-    def _parse_list_env(env_val: str | None) -> list[str]:
-        if not env_val:
-            return []
-        # Split on comma/space/semicolon, trim, drop empties.
-        parts = re.split(r"[,\s;]+", env_val.strip())
-        return [p for p in (s.strip() for s in parts) if p]
+    @classmethod
+    def get_supported_configs(cls) -> list[VariantFeatureConfig]:
+        """
+        This is the standardized method that `pip` will call.
+        Not cached itself: the detection getters are already cached per value of every env var they depend on.
+        Each feature is only probed when it isn't overridden: with both env vars set, no detection runs at all.
+        """
+        env_gfx = os.environ.get("AMD_VARIANT_PROVIDER_FORCE_GFX_ARCH")
+        rocm_version_env = os.environ.get("AMD_VARIANT_PROVIDER_FORCE_ROCM_VERSION")
+
+        # TODO: Prioritized list of GFX archs.
+        # E.g., dGPU might be preferred over iGPU; PCIe vs. APU.
+        gfx_archs = tuple(parse_list_env(env_gfx)) if env_gfx else None
+        rocm_version = cls._parse_forced_rocm_version(rocm_version_env)
+
+        if gfx_archs is None or rocm_version is None:
+            logger.debug("%s Running system detection.", cls._log_prefix)
+        if gfx_archs is None:
+            gfx_archs = get_gfx_archs()
+        if rocm_version is None:
+            rocm_version = get_rocm_version()
+
+        return cls._build_configs(gfx_archs, rocm_version)
 
-    @staticmethod
+    @classmethod
     @cache
-    def _system_info() -> dict[str, Any]:
+    def _parse_forced_rocm_version(cls, rocm_version_env: str | None) -> ROCmVersion | None:
         """
-        Probe the system once and cache the result.
+        Cached so that an invalid value is only warned about once per process, not on every call.
         """
-        return get_system_info()
+        if not rocm_version_env:
+            return None
+        # Same syntax as `AMD_ROCM_VERSION`; only major/minor are used.
+        rocm_version = parse_version(rocm_version_env, ROCmVersion)
+        if not rocm_version:
+            logger.warning("%s Ignoring invalid AMD_VARIANT_PROVIDER_FORCE_ROCM_VERSION=%r", cls._log_prefix, rocm_version_env)
+        return rocm_version
 
     @classmethod
     @cache
-    def get_supported_configs(cls) -> list[VariantFeatureConfig]:
+    def _build_configs(cls, gfx_archs: tuple[str, ...], rocm_version: ROCmVersion | None) -> list[VariantFeatureConfig]:
         """
-        This is the standardized method that `pip` will call.
+        Cached per detected (or forced) value, so that the result is only logged once per distinct input.
         """
-        logger.info(f"[{cls.namespace}-variant-provider] Running system detection.")
-
         configs: list[VariantFeatureConfig] = []
 
-        # TODO: Prioritized list of GFX archs.
-        # E.g., dGPU might be preferred over iGPU; PCIe vs. APU.
-        env_gfx = os.environ.get("AMD_VARIANT_PROVIDER_FORCE_GFX_ARCH")
-        if not env_gfx:
-            gfx_archs = cls._system_info().get(AMDVariantFeatureKey.GFX_ARCH)
-        else:
-            gfx_archs = cls._parse_list_env(env_gfx);
-
         # Priority 1: GFX architecture (most specific)
         if gfx_archs:
             # The list of all detected GFX architectures is provided.
@@ -94,35 +113,24 @@ class AMDVariantPlugin:
             #    VariantFeatureConfig(name=AMDVariantFeatureKey.GFX_ARCH, values=gfx_archs)
             #)
             configs.append(
-                VariantFeatureConfig(name=AMDVariantFeatureKey.GFX_ARCH, values=gfx_archs, multi_value=True)
+                VariantFeatureConfig(name=AMDVariantFeatureKey.GFX_ARCH, values=list(gfx_archs), multi_value=True)
             )
         # Priority 2: ROCm version (more general)
-        # Env var is type `str`
-        if rocm_version_env := os.environ.get("AMD_VARIANT_PROVIDER_FORCE_ROCM_VERSION", None):
-            rocm_version_list = rocm_version_env.strip().split('.')
-            assert(len(rocm_version_list) == 3)
-            rocm_version = ROCmVersion(*rocm_version_list)
-        else:
-            rocm_version = cls._system_info().get(AMDVariantFeatureKey.ROCM_VERSION)
         if rocm_version:
             configs.append(
                 VariantFeatureConfig(name=AMDVariantFeatureKey.ROCM_VERSION, values=[f"{rocm_version.major}.{rocm_version.minor}"], multi_value=False)
             )
 
         if configs:
-            logger.info(f"[{cls.namespace}-variant-provider] Detected features: {configs}")
+            logger.info("%s Detected features: %s", cls._log_prefix, configs)
         else:
-            logger.warning(f"[{cls.namespace}-variant-provider] No AMD features detected.")
+            logger.warning("%s No AMD features detected.", cls._log_prefix)
 
         return configs
 
     @classmethod
-    @cache
     def get_all_configs(cls) -> list[VariantFeatureConfig]:
-        return [
-                VariantFeatureConfig(name=AMDVariantFeatureKey.ROCM_VERSION, values=[f"7.{i}" for i in range(10, -1, -1)] + ["6.4", "6.3"], multi_value=False),
-                VariantFeatureConfig(name=AMDVariantFeatureKey.GFX_ARCH, values=["gfx900", "gfx906", "gfx908", "gfx90a", "gfx942", "gfx1030", "gfx1100", "gfx1101", "gfx1102", "gfx1200", "gfx1201"], multi_value=True),
-        ]
+        return _ALL_CONFIGS
 
 
 def main() -> int: